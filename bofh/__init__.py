@@ -36,6 +36,7 @@ Typical usage would look something like:
     print(obj.user.info('user'))
 
 """
+import functools
 import logging
 import ssl
 
@@ -56,7 +57,15 @@ def _is_https(url):
     return parts.scheme == 'https'
 
 
+@functools.lru_cache(maxsize=4)
 def _get_ssl_context(cert=None, ignore_hostname=False):
+    """
+    Get a shared SSLContext for a given cert and hostname check setting.
+
+    Recently used contexts are cached, so that certificates are only loaded
+    once, and so that TLS sessions from one connection can be resumed by the
+    next.
+    """
     context = ssl.create_default_context()
     if cert:
         context.load_verify_locations(cafile=cert)
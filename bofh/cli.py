@@ -18,35 +18,35 @@
 """
 An interactive Cerebrum XMLRPC cli client.
 """
-from __future__ import print_function, unicode_literals
-
 import argparse
+import functools
 import getpass
-import locale
 import logging
 import sys
-
-import six
-from six.moves.urllib.parse import urlparse
+from urllib.parse import urlparse
 
 import bofh
 import bofh.config
 import bofh.parser
 import bofh.proto
-import bofh.readlineui
 import bofh.version
 
 
 logger = logging.getLogger(__name__)
-dist_info = bofh.version.get_distribution()
+
+# Handler for silencing all log messages, see setup_logging()
+_null_handler = logging.NullHandler()
 
 
+@functools.lru_cache(maxsize=16)
 def complete_url(url):
     """Add default protocol and port number to url if these were omitted
     when entered from the command line. This is not meant to handle all
     url-variants that users may enter, but for allowing short-hand urls
     when developing/testing, (like: cere-utv01:8962, or cerebrum-uio.uio.no)
 
+    Results are cached, as the same url is typically completed over and over.
+
     :type: url: str
     :param url: Some url to a bofhd-instance.
 
@@ -58,73 +58,66 @@ def complete_url(url):
         # Pre-2.7 versions of urlparse will fail if no protocol
         # prefix is present.
         if '://' not in url:
-            url = ''.join((bofh.get_default_protocol(), '://', url))
+            url = '{}://{}'.format(bofh.config.DEFAULT_PROTOCOL, url)
 
         url_parts = urlparse(url)
         if url_parts.port is None:
-            url = ''.join((url, ':', bofh.get_default_port()))
+            url = url_parts._replace(netloc='{}:{}'.format(
+                url_parts.netloc, bofh.config.DEFAULT_PORT)).geturl()
     return url
 
 
 def setup_logging(verbosity):
     """ configure logging. """
     if verbosity < 0:
-        root = logging.getLogger()
-        root.addHandler(logging.NullHandler())
+        # Note: adding the same handler multiple times is a no-op
+        logging.getLogger().addHandler(_null_handler)
     else:
         level = bofh.config.get_verbosity(int(verbosity))
         bofh.config.configure_logging(level)
 
 
-def get_default_encoding():
-    """ guess encoding for arguments. """
-
-    def _iter_encodings():
-        yield locale.getdefaultlocale()[1]
-        yield sys.getfilesystemencoding()
-        yield sys.getdefaultencoding()
-
-    for encoding in _iter_encodings():
-        if encoding:
-            return encoding
-
-
 def bofh_eval(conn, line, prompt):
     parse = bofh.parser.parse(conn, line)
-    logger.debug("Got obj=%s, command=%r",
-                 repr(parse), repr(getattr(parse, 'command', None)))
+    logger.debug("Got obj=%r, command=%r",
+                 parse, getattr(parse, 'command', None))
     result = parse.eval(prompter=None, prompt=prompt)
-    logger.debug("Got result=%s", repr(result))
+    logger.debug("Got result=%r", result)
     if isinstance(result, list):
         result = '\n\n'.join(result)
     return result
 
 
-class UnicodeType(object):
-    """ Argparse transform for non-unicode input. """
+class VersionAction(argparse.Action):
+    """ Argparse action that prints the distribution version and exits.
 
-    def __init__(self, encoding=None):
-        self.encoding = encoding
+    Unlike the builtin 'version' action, the distribution is only looked up if
+    the option is actually given.
+    """
 
-    def __call__(self, value):
-        if isinstance(value, bytes):
-            value = value.decode(self.encoding)
-        return six.text_type(value)
+    def __init__(self, option_strings, dest=argparse.SUPPRESS,
+                 default=argparse.SUPPRESS,
+                 help="show program's version number and exit"):
+        super(VersionAction, self).__init__(
+            option_strings=option_strings,
+            dest=dest,
+            default=default,
+            nargs=0,
+            help=help)
 
-    def __repr__(self):
-        return 'UnicodeType(encoding={0})'.format(repr(self.encoding))
+    def __call__(self, parser, namespace, values, option_string=None):
+        dist_info = bofh.version.get_distribution()
+        parser.exit(message='{}\n'.format(dist_info))
 
 
 def main(inargs=None):
     parser = argparse.ArgumentParser(
         description="The Cerebrum Bofh client",
     )
-    default_encoding = get_default_encoding()
 
     parser.add_argument(
         '--version',
-        action='version',
-        version=str(dist_info))
+        action=VersionAction)
 
     connect_args = parser.add_argument_group('connection settings')
     connect_args.add_argument(
@@ -164,8 +157,7 @@ def main(inargs=None):
     output_args = parser.add_argument_group('output settings')
     output_args.add_argument(
         '-p', '--prompt',
-        default=bofh.readlineui.DEFAULT_PROMPT,
-        type=UnicodeType(default_encoding),
+        default=bofh.config.DEFAULT_PROMPT,
         help="use a custom prompt (default: %(default)r)",
         metavar='PROMPT',
     )
@@ -196,7 +188,6 @@ def main(inargs=None):
         '--cmd',
         action='append',
         dest='commands',
-        type=UnicodeType(default_encoding),
         help="run command %(metavar)s and exit",
         metavar='CMD',
     )
@@ -205,11 +196,15 @@ def main(inargs=None):
     setup_logging(args.verbosity)
     logger.debug('args: %r', args)
 
-    prompt_pass = bofh.readlineui.IOUtil(encoding=default_encoding).get_secret
+    # The readline ui is not needed for --help and --version
+    from bofh import readlineui
+
+    prompt_pass = readlineui.IOUtil().get_secret
 
-    print("Connecting to {}\n".format(complete_url(args.url)))
+    url = complete_url(args.url)
+    print("Connecting to {}\n".format(url))
     try:
-        conn = bofh.connect(url=complete_url(args.url),
+        conn = bofh.connect(url=url,
                             cert=args.cert,
                             insecure=args.insecure,
                             timeout=args.timeout)
@@ -232,12 +227,15 @@ def main(inargs=None):
                 sys.stdout.flush()
                 print(bofh_eval(conn, command, args.prompt))
         else:
-            bofh.readlineui.repl(conn, prompt=args.prompt)
+            readlineui.repl(conn, prompt=args.prompt)
     except Exception as e:
         logger.error("Unhandled error", exc_info=True)
         raise SystemExit('Error: {}'.format(e))
     finally:
-        conn.logout()
+        try:
+            conn.logout()
+        finally:
+            conn.close()
 
 
 if __name__ == '__main__':
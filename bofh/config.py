@@ -68,6 +68,7 @@ translated according to a mapping:
     2. :py:const:`logging.INFO`
     3. :py:const:`logging.DEBUG`
 """
+import functools
 import logging
 import os
 import sys
@@ -79,7 +80,8 @@ logger = logging.getLogger(__name__)
 # TODO: Consider using appdirs for windows support?
 # TODO: Replace default location with package_data for simplicity across
 #       platforms?
-DEFAULT_CONFIG_PATH = tuple((
+# Paths are normalized to absolute paths once, at import time.
+DEFAULT_CONFIG_PATH = tuple(os.path.abspath(path) for path in (
     # Read from standard locations?
     os.path.expanduser('~/.config/pybofh'),
     '/etc/pybofh',
@@ -94,6 +96,13 @@ DEFAULT_CONFIG_PATH = tuple((
 # TODO: Change this to https://localhost/ and put this url in a config.
 DEFAULT_URL = 'https://cerebrum-uio.uio.no:8000/'
 
+# Default protocol and port for short-hand urls (e.g. 'localhost')
+DEFAULT_PROTOCOL = 'https'
+DEFAULT_PORT = 8000
+
+# Default prompt in the interactive client
+DEFAULT_PROMPT = "bofh>>> "
+
 # Default logging format
 # TODO: Support logging config
 LOGGING_FORMAT = "%(levelname)s - %(name)s - %(message)s"
@@ -137,34 +146,81 @@ def configure_logging(level):
     """
     Enable and configure logging.
 
+    Logs are written to stderr, using :py:const:`LOGGING_FORMAT`.  Like
+    :py:func:`logging.basicConfig`, this does nothing if the root logger
+    already has handlers.
+
     :param int level: logging level
     """
-    logging.basicConfig(level=level, format=LOGGING_FORMAT)
+    root = logging.getLogger()
+    if root.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter(LOGGING_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(level)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_config_dir_index():
+    """
+    Get the contents of existing config directories.
+
+    Each directory is scanned once, so that subsequent lookups are simple
+    membership tests.
+
+    :rtype: tuple
+    :return:
+        (path, names) pairs for each existing directory in
+        :py:const:`DEFAULT_CONFIG_PATH`
+    """
+    index = []
+    for path in DEFAULT_CONFIG_PATH:
+        try:
+            with os.scandir(path) as entries:
+                names = frozenset(entry.name for entry in entries)
+        except OSError:
+            # missing directory, not a directory, no access, ...
+            continue
+        index.append((path, names))
+    return tuple(index)
 
 
 def iter_config_files(basename):
     """
     Iterate over files in config directories.
 
-    :param basename: filename (or relative path)
+    :param basename: filename, relative path, or absolute path
 
     :rtype: generator
     :return: returns matching files from :py:const:`DEFAULT_CONFIG_PATH`
     """
-    for path in DEFAULT_CONFIG_PATH:
-        logger.debug('looking for %r in %r', basename, os.path.abspath(path))
-        if not os.path.isdir(path):
+    if os.path.isabs(basename):
+        # An absolute path is used as is, regardless of the config dirs
+        if os.path.exists(basename):
+            logger.info('found %r', basename)
+            yield basename
+        return
+
+    # Only the first path component can be looked up in the directory index
+    head = basename.split(os.sep, 1)[0]
+    for path, names in _get_config_dir_index():
+        logger.debug('looking for %r in %r', basename, path)
+        if head not in names:
             continue
         candidate = os.path.join(path, basename)
-        if os.path.exists(candidate):
+        if head == basename or os.path.exists(candidate):
             logger.info('found %r', candidate)
             yield candidate
 
 
+@functools.lru_cache(maxsize=128)
 def get_config_file(basename):
     """
     Find the primary configuration file of a given name.
 
+    Results are cached, see :py:func:`invalidate_config_cache`.
+
     :param basename: filename (or relative path)
 
     :return:
@@ -173,5 +229,16 @@ def get_config_file(basename):
     """
     for filename in iter_config_files(basename):
         return filename
-    logger.warn('no %r found in config dirs', basename)
+    logger.warning('no %r found in config dirs', basename)
     return None
+
+
+def invalidate_config_cache():
+    """
+    Forget cached config directory contents and config files.
+
+    This is needed if files are added or removed from the config directories
+    after they have been looked up.
+    """
+    _get_config_dir_index.cache_clear()
+    get_config_file.cache_clear()
@@ -57,13 +57,11 @@ str_vars
 
 
 """
-from __future__ import absolute_import, unicode_literals
-
 import abc
+import collections.abc
+import functools
 import logging
-
-import six
-from six.moves import reduce
+import re
 
 logger = logging.getLogger(__name__)
 
@@ -84,25 +82,57 @@ class FieldRef(object):
     as <params>
     """
 
+    __slots__ = ('name', 'type', 'params', '_strftime_format', '_convert')
+
     def __init__(self, field_name, field_type=None, field_params=None):
         self.name = field_name
         self.type = field_type or None
         self.params = field_params or None
 
+        # Date fields are converted once, rather than for each formatted value
+        if self.type == 'date' and self.params:
+            self._strftime_format = sdf2strftime(self.params)
+        else:
+            self._strftime_format = None
+
+        # Value conversion for this field type, see format_value()
+        self._convert = _type_handlers.get(self.type, _convert_invalid)
+
     def __repr__(self):
         return '<{cls.__name__} {obj.name}>'.format(cls=type(self), obj=self)
 
     @classmethod
+    @functools.lru_cache(maxsize=512)
     def from_str(cls, field_ref):
-        try:
-            field_name, field_type, field_params = field_ref.split(":", 2)
-        except ValueError:
+        """
+        Get a FieldRef from a field reference string.
+
+        The same field references tend to re-appear in many format
+        suggestions, so the resulting (shared) FieldRef objects are cached.
+        """
+        parts = field_ref.split(":", 2)
+        if len(parts) == 3:
+            field_name, field_type, field_params = parts
+        else:
             field_name, field_type, field_params = (field_ref, None, None)
         return cls(field_name,
                    field_type=field_type,
                    field_params=field_params)
 
 
+# java.text.SimpleDateFormat to strftime conversions
+_SDF_MAP = {
+    "yyyy": "%Y",
+    "MM": "%m",
+    "dd": "%d",
+    "HH": "%H",
+    "mm": "%M",
+    "ss": "%S",
+}
+_SDF_RE = re.compile("|".join(map(re.escape, _SDF_MAP)))
+
+
+@functools.lru_cache(maxsize=256)
 def sdf2strftime(sdf_string):
     """
     Convert java SimpleDateFormat to strftime.
@@ -110,16 +140,46 @@ def sdf2strftime(sdf_string):
     The bofhd server returns date formatting hints in a
     `java.text.SimpleDateFormat` syntax, because reasons.
     """
-    conversions = (
-        # (subst, with),
-        ("yyyy", "%Y"),
-        ("MM", "%m"),
-        ("dd", "%d"),
-        ("HH", "%H"),
-        ("mm", "%M"),
-        ("ss", "%S"),
-    )
-    return reduce(lambda f, r: f.replace(*r), conversions, sdf_string)
+    return _SDF_RE.sub(lambda m: _SDF_MAP[m.group(0)], sdf_string)
+
+
+def _convert_none(field_ref, value):
+    return value
+
+
+def _convert_date(field_ref, value):
+    return value.strftime(field_ref._strftime_format) if value else value
+
+
+def _convert_invalid(field_ref, value):
+    raise ValueError("invalid field_ref type %r" % (field_ref.type, ))
+
+
+# Value conversions by FieldRef type
+_type_handlers = {
+    None: _convert_none,
+    'date': _convert_date,
+}
+
+
+def format_value(field_ref, value):
+    """
+    Format a single field value
+
+    :type field_ref: FieldRef
+    :param field_ref:
+        the field reference that the value belongs to
+
+    :param value:
+        a value from a data set
+    """
+    # Convert value according to field_type and field_data
+    value = field_ref._convert(field_ref, value)
+
+    if value is None:
+        return "<not set>"
+    else:
+        return value
 
 
 def get_formatted_field(field_ref, data_set):
@@ -134,21 +194,11 @@ def get_formatted_field(field_ref, data_set):
     :param data_set:
         a data set in the result from running a command
     """
-    value = data_set[field_ref.name]
+    return format_value(field_ref, data_set[field_ref.name])
 
-    # Convert value according to field_type and field_data
-    if field_ref.type is None:
-        pass
-    elif field_ref.type == 'date':
-        format_str = str(sdf2strftime(field_ref.params))
-        value = value.strftime(format_str) if value else value
-    else:
-        raise ValueError("invalid field_ref type %r" % (field_ref.type, ))
 
-    if value is None:
-        return "<not set>"
-    else:
-        return value
+# Marker for missing values in FormatItem.try_format()
+_MISSING = object()
 
 
 class FormatItem(object):
@@ -159,6 +209,8 @@ class FormatItem(object):
     format string, and an optional header.
     """
 
+    __slots__ = ('format_str', 'fields', 'header', '_names', '_name_set')
+
     def __init__(self, format_str, fields=None, header=None):
         """
         :param str format_str:
@@ -172,6 +224,10 @@ class FormatItem(object):
         self.fields = tuple(fields or ())
         self.header = header
 
+        # Field names, for checking data sets without looping over self.fields
+        self._names = tuple(f.name for f in self.fields)
+        self._name_set = frozenset(self._names)
+
     def __repr__(self):
         return '<FormatItem fields=%r>' % (tuple(f.name for f in self.fields),)
 
@@ -186,7 +242,13 @@ class FormatItem(object):
         :returns:
             Returns missing field names (keys) missing in the data_set.
         """
-        return tuple(f.name for f in self.fields if f.name not in data_set)
+        try:
+            if self._name_set <= data_set.keys():
+                return ()
+        except AttributeError:
+            # not a mapping
+            pass
+        return tuple(name for name in self._names if name not in data_set)
 
     def match(self, data_set):
         """
@@ -200,7 +262,11 @@ class FormatItem(object):
             True if the data_set contains all required field references in
             self.field.
         """
-        return not bool(self.mismatches(data_set))
+        try:
+            return self._name_set <= data_set.keys()
+        except AttributeError:
+            # not a mapping
+            return all(name in data_set for name in self._names)
 
     def format(self, data_set):
         """
@@ -208,11 +274,32 @@ class FormatItem(object):
 
         :type data_set: dict
 
-        :rtype: six.text_type
+        :rtype: str
+        """
+        values = [format_value(f, data_set[f.name]) for f in self.fields]
+        return self.format_str % tuple(values)
+
+    def try_format(self, data_set):
+        """
+        Format a given data set, if this FormatItem applies to it.
+
+        This is equivalent to checking :py:meth:`match` before calling
+        :py:meth:`format`, but only looks up each field once.
+
+        :type data_set: dict
+
+        :rtype: str, None
+        :returns:
+            The formatted data set, or None if the data set is missing any of
+            the fields in self.fields.
         """
-        values = tuple(get_formatted_field(f, data_set)
-                       for f in self.fields)
-        return self.format_str % values
+        values = []
+        for field in self.fields:
+            value = data_set.get(field.name, _MISSING)
+            if value is _MISSING:
+                return None
+            values.append(format_value(field, value))
+        return self.format_str % tuple(values)
 
 
 class FormatSuggestion(object):
@@ -223,11 +310,20 @@ class FormatSuggestion(object):
     for items (usually dicts) in a bofhd server response.
     """
 
+    __slots__ = ('items', 'header')
+
     key_header = "hdr"
     key_string_vars = "str_vars"
 
     def __init__(self, items, header=None):
-        self.items = items
+        """
+        :param items:
+            A sequence of :py:class:`FormatItem` objects.  The items are stored
+            as a tuple, so that they can be iterated over again and again.
+        :param str header:
+            An optional header for the formatted response.
+        """
+        self.items = tuple(items)
         self.header = header
 
     def __len__(self):
@@ -239,7 +335,7 @@ class FormatSuggestion(object):
     @staticmethod
     def _iter_format_strings(string_vars):
         """Generate FormatItems from a sequence of str_vars."""
-        if isinstance(string_vars, six.string_types):
+        if isinstance(string_vars, str):
             # For some reason, we got a single format string rather than a
             # sequence of (format, (vars, ...)) tuples.
             yield FormatItem(string_vars, None, None)
@@ -258,7 +354,7 @@ class FormatSuggestion(object):
                 sub_header = None
             else:
                 raise ValueError("invalid tuple length (%d)" % (len(t), ))
-            fields = map(FieldRef.from_str, field_refs or ())
+            fields = tuple(FieldRef.from_str(ref) for ref in field_refs or ())
             yield FormatItem(format_str, fields=fields, header=sub_header)
 
     @classmethod
@@ -281,8 +377,7 @@ class FormatSuggestion(object):
         return cls(items, header=header)
 
 
-@six.add_metaclass(abc.ABCMeta)
-class ResponseFormatter(object):
+class ResponseFormatter(object, metaclass=abc.ABCMeta):
     """ Abstract response formatter. """
 
     @abc.abstractmethod
@@ -301,12 +396,16 @@ class StringFormatter(ResponseFormatter):
     """Response formatter for commands without a format suggestion."""
 
     def __call__(self, response):
-        if isinstance(response, six.string_types):
+        if isinstance(response, str):
             return response
         else:
             return repr(response)
 
 
+# StringFormatter has no state, so a single instance can be shared
+_string_formatter = StringFormatter()
+
+
 class SuggestionFormatter(ResponseFormatter):
     """
     Response formatter for commands with a format suggestion.
@@ -315,29 +414,41 @@ class SuggestionFormatter(ResponseFormatter):
         self.suggestion = format_suggestion
 
     def _generate_lines(self, response):
+        # Pre-formatted (string) items are output as-is by every format item,
+        # and other non-dict items are never matched by any of them, so we
+        # only need to check the type of each item once.
+        parts = tuple(
+            (part, data_item, isinstance(data_item, str))
+            for part, data_item in enumerate(response, 1)
+            if isinstance(data_item, (str, collections.abc.Mapping)))
+        log_info = logger.isEnabledFor(logging.INFO)
         if self.suggestion.header:
             yield self.suggestion.header
         for fmt_no, fmt_item in enumerate(self.suggestion, 1):
-            logger.info('processing formatter %d/%d: %r',
-                        fmt_no, len(self.suggestion), fmt_item)
+            if log_info:
+                logger.info('processing formatter %d/%d: %r',
+                            fmt_no, len(self.suggestion), fmt_item)
             if fmt_item.header:
                 yield fmt_item.header
-            for part, data_item in enumerate(response, 1):
-                if isinstance(data_item, six.string_types):
+            try_format = fmt_item.try_format
+            for part, data_item, is_text in parts:
+                if is_text:
                     yield data_item
                     continue
-                if fmt_item.mismatches(data_item):
-                    continue
                 try:
-                    yield fmt_item.format(data_item)
+                    line = try_format(data_item)
                 except Exception:
                     logger.error("unable to format response part %d",
                                  part, exc_info=True)
+                    continue
+                if line is not None:
+                    yield line
 
     def __call__(self, response):
         if not isinstance(response, (list, tuple)):
-            response = [response]
-        logger.info('formatting response with %d part(s)', len(response))
+            response = (response,)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info('formatting response with %d part(s)', len(response))
         return "\n".join(self._generate_lines(response))
 
 
@@ -346,7 +457,7 @@ def get_formatter(format_spec):
     Get an appropriate formatter.
     """
     logger.debug('get_formatter(%r)', format_spec)
-    default = StringFormatter()
+    default = _string_formatter
     if not format_spec:
         return default
     else:
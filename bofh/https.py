@@ -21,6 +21,7 @@ from __future__ import absolute_import, unicode_literals
 
 import logging
 import socket
+import ssl
 
 from six.moves import xmlrpc_client as _xmlrpc
 from six.moves.http_client import HTTPConnection, HTTPSConnection
@@ -65,21 +66,91 @@ class Transport(_XmlRpcTimeoutMixin):
     pass
 
 
+class _ResumingHTTPSConnection(HTTPSConnection, object):
+    """
+    HTTPSConnection that tries to resume a previous TLS session.
+
+    Resuming a session allows for an abbreviated TLS handshake when we need to
+    reconnect, e.g. after the server has closed an idle connection.  Note that
+    the session can only be re-used with the SSLContext that created it.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.tls_session = kwargs.pop('tls_session', None)
+        super(_ResumingHTTPSConnection, self).__init__(*args, **kwargs)
+
+    def connect(self):
+        # Re-implementation of HTTPSConnection.connect, with session
+        HTTPConnection.connect(self)
+        kwargs = {'server_hostname': self._tunnel_host or self.host}
+        if self.tls_session is not None:
+            kwargs['session'] = self.tls_session
+        try:
+            self.sock = self._context.wrap_socket(self.sock, **kwargs)
+        except ValueError:
+            if 'session' not in kwargs:
+                raise
+            # The session belongs to some other SSLContext.  The socket is
+            # gone with the failed handshake, so start over without it.
+            logger.debug('unable to resume tls session with %r', self.host,
+                         exc_info=True)
+            self.sock.close()
+            self.tls_session = None
+            return self.connect()
+        if (getattr(self, '_check_hostname', False) and
+                not self._context.check_hostname):
+            # Python 3.6 checks the hostname itself if the context doesn't
+            try:
+                ssl.match_hostname(self.sock.getpeercert(),
+                                   kwargs['server_hostname'])
+            except Exception:
+                self.sock.shutdown(socket.SHUT_RDWR)
+                self.sock.close()
+                raise
+        if getattr(self.sock, 'session_reused', False):
+            logger.debug('resumed tls session with %r', self.host)
+
+    def close(self):
+        # Keep the current session for the next connection.  With TLS 1.3,
+        # session tickets are sent *after* the handshake, so the session is
+        # collected as late as possible.
+        session = getattr(self.sock, 'session', None)
+        if session is not None:
+            self.tls_session = session
+        super(_ResumingHTTPSConnection, self).close()
+
+
 class SafeTransport(_XmlRpcTimeoutMixin, _xmlrpc.SafeTransport, object):
     """
-    xmlrpc.client.SafeTransport with timeout setting
+    xmlrpc.client.SafeTransport with timeout setting and TLS session
+    resumption.
+
+    Sessions are only carried over to new connections if the transport has
+    a shared SSLContext.  Without one, each connection creates its own
+    context, and the sessions of one connection are useless to the next.
     """
 
+    def __init__(self, *args, **kwargs):
+        self._tls_session = None
+        super(SafeTransport, self).__init__(*args, **kwargs)
+
     def _make_connection(self, host):
         chost, self._extra_headers, x509 = self.get_host_info(host)
-        conn = HTTPSConnection(
+        conn = _ResumingHTTPSConnection(
             chost,
             None,
             timeout=self.timeout,
             context=self.context,
+            tls_session=self._tls_session,
             **(x509 or {}))
         return conn
 
+    def close(self):
+        conn = self._connection[1]
+        super(SafeTransport, self).close()
+        if conn is not None and self.context is not None:
+            self._tls_session = conn.tls_session
+
 
 __all__ = (
     'SafeTransport',
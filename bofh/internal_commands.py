@@ -40,7 +40,8 @@ import io
 import logging
 import os
 
-from bofh.readlineui import DEFAULT_PROMPT
+from . import parser
+from .config import DEFAULT_PROMPT
 
 # Helptexts for the help() function
 _helptexts = {
@@ -53,6 +54,13 @@ _helptexts = {
 logger = logging.getLogger(__name__)
 
 
+def _get_helptext(bofh, arg):
+    """Get help for a single internal command or command group."""
+    if arg in _helptexts:
+        return _helptexts[arg]
+    return bofh.help(arg)
+
+
 def help(bofh, *args, **kw):
     """
     The help command.
@@ -75,10 +83,9 @@ def help(bofh, *args, **kw):
     if len(args) == 1:
         arg = args[0]
         if isinstance(arg, (list, tuple, set)):
-            return "\n".join(map(lambda x: help(bofh, x), arg))
-        if arg in _helptexts:
-            return _helptexts[arg]
-        return bofh.help(arg)
+            # Lists can't be nested, see bofh.parser.parse_string_or_list()
+            return "\n".join([_get_helptext(bofh, a) for a in arg])
+        return _get_helptext(bofh, arg)
     help_text = bofh.help(*args)
     if not help_text:
         help_text = "No help text found"
@@ -97,8 +104,8 @@ def source(bofh, ignore_errors=False, script=None, encoding='utf-8',
     :param script: The script fie to execute.
     :param prompt: Prompt string given as argument to bofh
     """
-    logger.debug('source(%s, ignore_errors=%r, script=%r, encoding=%r)',
-                 repr(bofh), ignore_errors, script, encoding)
+    logger.debug('source(%r, ignore_errors=%r, script=%r, encoding=%r)',
+                 bofh, ignore_errors, script, encoding)
 
     # TODO: Should probably raise some exception here to indicate an error,
     # rather than returning an error string...
@@ -106,44 +113,55 @@ def source(bofh, ignore_errors=False, script=None, encoding='utf-8',
         return 'Source file not given'
     if script.startswith('~'):
         script = os.path.expanduser(script)
+
+    # Only accept regular files, as opening e.g. a fifo would block
     if not os.path.isfile(script):
         return 'Filename "{}" does not exist.'.format(script)
+
+    # Read the entire script up front, so that the file isn't kept open
+    # while running commands
+    try:
+        with io.open(script, mode='r', encoding=encoding) as src:
+            lines = src.read().split('\n')
+    except OSError as e:
+        return 'Unable to read "{}": {}'.format(script, e.strerror or e)
+
     if not prompt:
         prompt = DEFAULT_PROMPT
 
     ret = []
 
-    from .parser import parse
-    with io.open(script, mode='r', encoding=encoding) as src:
-        for line_no, line in enumerate(src, 1):
-            stripped = line.strip()
-            if not stripped or stripped.startswith('#'):
-                continue
-            try:
-                parsed = parse(bofh, stripped)
-                logger.info("Running %r (from %s:%d)",
-                            stripped, script, line_no)
-                result = '%s%s\n' % (prompt, stripped) + parsed.eval()
-                if isinstance(result, (list, tuple)):
-                    # result may be a list of formatted responses if using
-                    # tuples in the command itself ("user info (foo bar)")
-                    ret.extend(result)
-                    logger.info("Got %d results", len(result))
-                else:
-                    ret.append(result)
-                    logger.info("Got 1 result")
-            except BaseException as e:
-                logger.error("Error running %r (%s:%d)", stripped, script,
-                             line_no, exc_info=True)
-                if not ignore_errors:
-                    ret.append('Error: %s' % str(e))
-                    ret.append('Sourcing of %s aborted on line %d' % (script,
-                                                                      line_no))
-                    ret.append(
-                        'Hint: Use \'source --ignore-errors file\' to '
-                        'ignore errors')
-                    break
-                ret.append('Error: %s (on line %d)' % (str(e), line_no))
+    for line_no, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        try:
+            parsed = parser.parse(bofh, stripped)
+            logger.info("Running %r (from %s:%d)",
+                        stripped, script, line_no)
+            result = parsed.eval()
+            if isinstance(result, (list, tuple)):
+                # result may be a list of formatted responses if using
+                # tuples in the command itself ("user info (foo bar)")
+                ret.append('%s%s' % (prompt, stripped))
+                ret.extend(result)
+                logger.info("Got %d results", len(result))
+            else:
+                ret.append('%s%s\n%s' % (prompt, stripped, result))
+                logger.info("Got 1 result")
+        except Exception as e:
+            logger.error("Error running %r (%s:%d)", stripped, script,
+                         line_no, exc_info=True)
+            error = str(e)
+            if not ignore_errors:
+                ret.extend((
+                    'Error: %s' % (error, ),
+                    'Sourcing of %s aborted on line %d' % (script, line_no),
+                    'Hint: Use \'source --ignore-errors file\' to '
+                    'ignore errors',
+                ))
+                break
+            ret.append('Error: %s (on line %d)' % (error, line_no))
     return ret
 
 
@@ -155,8 +173,8 @@ def script(bofh, file=None, replace=False, encoding='utf-8', **kw):
     :type bofh: bofh.proto.Bofh
     :param file:
     """
-    logger.debug('script(%s, file=%r, replace=%r, encoding=%r)',
-                 repr(bofh), file, replace, encoding)
+    logger.debug('script(%r, file=%r, replace=%r, encoding=%r)',
+                 bofh, file, replace, encoding)
     from . import readlineui
     mode = 'w' if replace else 'a'
     if file:
@@ -183,6 +201,16 @@ def quit(bofh):
     raise SystemExit(0)
 
 
+def _sorted_commands(obj):
+    """
+    Get sorted (name, value) pairs from a bofh object or command group.
+
+    :type obj: bofh.proto.Bofh, bofh.proto._CommandGroup
+    """
+    return [(name, obj.get_bofh_command_value(name))
+            for name in sorted(obj.get_bofh_command_keys())]
+
+
 def commands(bofh):
     """List the commands available in bofh
 
@@ -190,13 +218,11 @@ def commands(bofh):
     :returns: A prettyprinted list of commands from bofh with args
     """
     logger.debug('commands(%r)', bofh)
-    ret = []
-    wide = 0
-    for grpname in sorted(bofh.get_bofh_command_keys()):
-        grp = getattr(bofh, grpname)
-        for cmdname in sorted(grp.get_bofh_command_keys()):
-            cmd = getattr(grp, cmdname)
-            fullname = cmd._fullname
-            wide = max(wide, len(fullname))
-            ret.append([fullname, [grpname, cmdname] + map(unicode, cmd.args)])
-    return "\n".join(map(lambda x: "%-*s -> %s" % tuple([wide] + x), ret))
+    rows = [
+        (cmd._fullname, [grpname, cmdname] + [str(a) for a in cmd.args])
+        for grpname, grp in _sorted_commands(bofh)
+        for cmdname, cmd in _sorted_commands(grp)
+    ]
+    wide = max((len(fullname) for fullname, _ in rows), default=0)
+    return "\n".join(["%-*s -> %s" % (wide, fullname, names)
+                      for fullname, names in rows])
@@ -24,17 +24,15 @@ interactive python client.
 Parsing input commands are neccessary in order to e.g. provide command
 completion.
 """
-from __future__ import absolute_import, unicode_literals
-
+import bisect
 import logging
 import os
 
-import six
+from . import internal_commands
 
 logger = logging.getLogger(__name__)
 
 
-@six.python_2_unicode_compatible
 class SynErr(Exception):
     """Base class for all command syntax errors."""
     def __init__(self, msg, index=None, completions=None):
@@ -78,6 +76,8 @@ class NoGroup(SynErr):
 class Command(object):
     """Base class for commands returned by :func:`parse`"""
 
+    __slots__ = ('args', 'bofh', 'line')
+
     def __init__(self, bofh, line):
         self.args = []
         self.bofh = bofh
@@ -153,6 +153,8 @@ def _prepare_args(args):
 class BofhCommand(Command):
     """Parser representation of a bofh command."""
 
+    __slots__ = ('command',)
+
     def set_command(self, command):
         """
         Set command implementation
@@ -183,34 +185,37 @@ class BofhCommand(Command):
 class InternalCommand(Command):
     """A command object for an internal command."""
 
+    __slots__ = ()
+
     def eval(self, prompt=None, *rest, **kw):
         """
         Evaluate internal commands.
 
         Finds command in :py:mod:`bofh.internal_commands`, and calls it.
         """
-        from . import internal_commands as where
         args = list(_prepare_args(self.args))
         cmdname = args.pop(0)
-        cmdref = getattr(where, cmdname)
+        cmdref = getattr(internal_commands, cmdname)
         return cmdref(self.bofh, *args, prompt=prompt)
 
 
 class HelpCommand(InternalCommand):
     """Help command"""
-    pass
+
+    __slots__ = ()
 
 
 class SingleCommand(InternalCommand):
     """An internal command taking no args"""
 
+    __slots__ = ('command', 'index', 'cmdref')
+
     def __init__(self, bofh, fullcmd, cmd, index, line):
         super(SingleCommand, self).__init__(bofh, line)
         self.command = cmd
         self.index = index
         self.args = [(cmd, index, [fullcmd])]
-        from . import internal_commands as where
-        self.cmdref = getattr(where, fullcmd)
+        self.cmdref = getattr(internal_commands, fullcmd)
 
     def eval(self, *rest, **kw):
         return self.cmdref(self.bofh)
@@ -232,10 +237,26 @@ class ArgCompleter(object):
         return []  # perhaps do something here based on arg type
 
 
+def _get_arg_completers(cmd_obj):
+    """
+    Get (cached) ArgCompleter objects for the arguments of a command.
+
+    :type cmd_obj: bofh.proto._Command
+    :rtype: tuple
+    """
+    cache = getattr(cmd_obj, '_parser_cache', {})
+    try:
+        return cache['completers']
+    except KeyError:
+        completers = cache['completers'] = tuple(
+            ArgCompleter(expected) for expected in cmd_obj.args)
+        return completers
+
+
 def _is_file(fname):
     """Quick check if fname is the name of a readable file"""
-    fname = os.path.realpath(fname)
-    return os.path.exists(fname) and os.path.isfile(fname)
+    # isfile() follows symlinks, there is no need to resolve them first
+    return os.path.isfile(fname)
 
 
 def _parse_bofh_command(bofh, fullgrp, group, start, lex, line):
@@ -247,10 +268,10 @@ def _parse_bofh_command(bofh, fullgrp, group, start, lex, line):
 
     :type bofh: bofh.proto.Bofh
 
-    :type fullgrp: six.text_type
+    :type fullgrp: str
     :param fullgrp: The command group name
 
-    :type group: six.text_type
+    :type group: str
     :param group: Partial or full name of a command within the command group
 
     :type start: int
@@ -259,7 +280,7 @@ def _parse_bofh_command(bofh, fullgrp, group, start, lex, line):
     :type lex: generator
     :param lex: A :func:`lexer` generator
 
-    :type line: six.text_type
+    :type line: str
     :param line: The line to parse
 
     :rtype: BofhCommand
@@ -288,16 +309,16 @@ def _parse_bofh_command(bofh, fullgrp, group, start, lex, line):
     if solematch:
         cmd_obj = getattr(grp, solematch)
         ret.set_command(cmd_obj)
-        for expected in cmd_obj.args:
+        for completer in _get_arg_completers(cmd_obj):
             try:
                 arg, idx = parse_string_or_list(lex)
-                ret.append(arg, idx, ArgCompleter(expected))
+                ret.append(arg, idx, completer)
             except IncompleteParse as e:  # arg, idx = e.parse
                 if e.parse:
                     arg, idx = e.parse
-                    ret.append(arg, idx, ArgCompleter(expected))
+                    ret.append(arg, idx, completer)
                 # TODO/TBD: use e.completions?
-                ret.append("", -1, ArgCompleter(expected))
+                ret.append("", -1, completer)
         try:
             while True:
                 arg, idx = parse_string_or_list(lex)
@@ -305,7 +326,7 @@ def _parse_bofh_command(bofh, fullgrp, group, start, lex, line):
         except IncompleteParse as e:
             if e.parse:
                 arg, idx = parse_string_or_list(lex)
-                ret.append(arg, idx, ArgCompleter(expected))
+                ret.append(arg, idx, completer)
                 raise IncompleteParse(e.args[0], ret, e.completions)
     return ret
 
@@ -336,12 +357,10 @@ def _parse_help(bofh, fullgrp, group, start, lex, line):
                 args.append(e.parse)
             break
 
-    localcmds = get_internal_commands()
     if len(args) > 2:
         raise SynErr("Too many arguments for help", args[2][1])
 
-    bofhcmds = get_bofh_commands(bofh)
-    allcmds = localcmds + bofhcmds
+    allcmds = get_all_commands(bofh)
 
     if len(args) == 0:
         # No arguments - all commands/groups are valid completions
@@ -352,14 +371,14 @@ def _parse_help(bofh, fullgrp, group, start, lex, line):
         def match_item(cmd, expected):
             if isinstance(cmd[0], (list, tuple, set)):
                 return (
-                    tuple(map(lambda x: match_item(x, expected), cmd[0])),
+                    tuple(match_item(x, expected) for x in cmd[0]),
                     cmd[1],
                     [],
                 )
             return (
                 cmd[0],
                 cmd[1],
-                list(filter(lambda x: x.startswith(cmd[0]), expected)),
+                list(_match_prefix(expected, cmd[0])),
             )
 
         cmd, idx, completes = match_item(args[0], allcmds)
@@ -371,7 +390,7 @@ def _parse_help(bofh, fullgrp, group, start, lex, line):
         else:
             grp = bofh.get_bofh_command_value(*completes)
             if grp:
-                grpcmds = tuple(sorted(grp.get_bofh_command_keys()))
+                grpcmds = get_bofh_commands(grp)
                 if len(args) == 2:
                     cmd, idx, completes = match_item(args[1], grpcmds)
                     ret.append(cmd, idx, completes)
@@ -499,27 +518,105 @@ _internal_cmds = {
 }
 
 
+# Sorts after any character in command names, see CommandIndex.startswith()
+_MAX_CHAR = '\U0010ffff'
+
+
+class CommandIndex(tuple):
+    """
+    A sorted tuple of command names, with fast prefix lookups.
+
+    Matching a partial command name is a binary search for the first and
+    last name with that prefix, rather than a scan of all the names.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, names=()):
+        return super(CommandIndex, cls).__new__(cls, sorted(names))
+
+    def __contains__(self, name):
+        i = bisect.bisect_left(self, name)
+        return i < len(self) and self[i] == name
+
+    def startswith(self, prefix):
+        """
+        Get all names that start with a given prefix.
+
+        :rtype: tuple
+        """
+        if not prefix:
+            return tuple(self)
+        lo = bisect.bisect_left(self, prefix)
+        hi = bisect.bisect_left(self, prefix + _MAX_CHAR, lo)
+        return self[lo:hi]
+
+
+def _match_prefix(names, prefix):
+    """
+    Get all names that start with a given prefix.
+
+    :param names: A sequence, or a :class:`CommandIndex` of names.
+
+    :rtype: tuple
+    """
+    if isinstance(names, CommandIndex):
+        return names.startswith(prefix)
+    return tuple(name for name in names if name.startswith(prefix))
+
+
+# Internal commands never change
+_internal_cmd_index = CommandIndex(_internal_cmds)
+
+
 def get_bofh_commands(bofh, groupname=None):
+    """
+    Get the command groups of a bofh object, or the commands in a group.
+
+    The result is cached until the commands change, see
+    :py:meth:`bofh.proto.Bofh._init_commands`.
+
+    :rtype: CommandIndex
+    """
     if groupname is not None:
         bofh = getattr(bofh, groupname)
-    return tuple(sorted(bofh.get_bofh_command_keys()))
+    cache = getattr(bofh, '_parser_cache', {})
+    try:
+        return cache['commands']
+    except KeyError:
+        index = cache['commands'] = CommandIndex(bofh.get_bofh_command_keys())
+        return index
 
 
 def get_internal_commands():
-    return tuple(sorted(_internal_cmds.keys()))
+    return _internal_cmd_index
+
+
+def get_all_commands(bofh):
+    """
+    Get all internal commands and command groups of a bofh object.
+
+    :rtype: CommandIndex
+    """
+    cache = getattr(bofh, '_parser_cache', {})
+    try:
+        return cache['all']
+    except KeyError:
+        index = cache['all'] = CommandIndex(get_internal_commands() +
+                                            get_bofh_commands(bofh))
+        return index
 
 
 def parse(bofh, text):
     """
     Parses a command
 
-    :type text: six.text_type
+    :type text: str
     :param text: A text string to parse.
     """
     lex = lexer(text)
-    localcmds = get_internal_commands()
     bofhcmds = get_bofh_commands(bofh)
-    allcmds = localcmds + bofhcmds
+    allcmds = get_all_commands(bofh)
     try:
         group, idx, fltrcmds, solematch = parse_string(lex, allcmds)
     except IncompleteParse:
@@ -562,18 +659,18 @@ def parse_string(lex, expected=None):
     :raises SynErr: If read item is a paren
     """
     expected = expected or tuple()
-    try:
-        val, idx = next(lex)
-    except StopIteration:
+    token = next(lex, None)
+    if token is None:
         raise IncompleteParse("Incomplete command, possible subcommands", "",
                               expected)
+    val, idx = token
     if idx == -1:
         # XXX: Do sane stuff here
         raise IncompleteParse("Expected %r, got nothing" % (val,), "",
                               expected)
     if val in ('(', ')'):
         raise SynErr("Expected string, got %r" % (val,), idx)
-    expected = tuple(value for value in expected if value.startswith(val))
+    expected = _match_prefix(expected, val)
     if len(expected) == 1:
         solematch = expected[0]
     elif val in expected:
@@ -583,72 +680,66 @@ def parse_string(lex, expected=None):
     return val, idx, expected, solematch
 
 
+def _parse_list(lex):
+    """Get a list of strings from lexer, after an opening paren"""
+    # parse until we get a )
+    ret = []
+    for val, idx in lex:
+        if idx == -1:
+            # signals missing char after \ or missing matching ".
+            # gets either ", -1 or some last token
+            token = next(lex, None)
+            if token is None:  # no last token
+                raise IncompleteParse(
+                    "Expected %s, got nothing" %
+                    ("something" if val == '\\' else ')'),
+                    ret, [])
+            val1, idx1 = token
+            if idx1 == -1:  # signal we want both a \ ending and a "
+                # check if the last token waits.
+                token = next(lex, None)
+                if token is not None:
+                    ret.append(token)
+                raise IncompleteParse(
+                    "Expected something and \", got nothing",
+                    ret, [' ")'])
+            else:
+                # val1, idx1 holds the last token
+                ret.append((val1, idx1))
+                raise IncompleteParse(
+                    "Expected %s, got nothing" %
+                    ("something" if val == "\\" else ')'),
+                    ret, [' )' if val == "\\" else '")'])
+        elif val == '(':
+            # we don't know what to do
+            # XXX: should we continue parsing?
+            raise SynErr("Nested list expression", idx)
+        elif val == ')':
+            return ret
+        ret.append((val, idx))
+    raise IncompleteParse("Expected ), got nothing", ret, [])
+
+
 def parse_string_or_list(lex):
     """Get a string or list of strings from lexer"""
-    def parse_list():
-        # parse until we get a )
-        ret = []
-        for val, idx in lex:
-            if idx == -1:
-                # signals missing char after \ or missing matching ".
-                try:
-                    # gets either ", -1 or some last token
-                    val1, idx1 = next(lex)
-                except StopIteration:  # no last token
-                    raise IncompleteParse(
-                        "Expected %s, got nothing" %
-                        ("something" if val == '\\' else ')'),
-                        ret, [])
-                if idx1 == -1:  # signal we want both a \ ending and a "
-                    try:  # check if the last token waits.
-                        val1, idx1 = next(lex)
-                        ret.append((val1, idx1))
-                        raise IncompleteParse(
-                            "Expected something and \", got nothing",
-                            ret, [' ")'])
-                    except StopIteration:
-                        raise IncompleteParse(
-                            "Expected something and \", got nothing",
-                            ret, [' ")'])
-                else:
-                    # val1, idx1 holds the last token
-                    ret.append((val1, idx1))
-                    raise IncompleteParse(
-                        "Expected %s, got nothing" %
-                        ("something" if val == "\\" else ')'),
-                        ret, [' )' if val == "\\" else '")'])
-            elif val == '(':
-                # we don't know what to do
-                # XXX: should we continue parsing?
-                raise SynErr("Nested list expression", idx)
-            elif val == ')':
-                return ret
-            ret.append((val, idx))
-        raise IncompleteParse("Expected ), got nothing", ret, [])
-
-    try:
-        val, idx = next(lex)
-    except StopIteration:
+    token = next(lex, None)
+    if token is None:
         raise IncompleteParse(
             "Expected string or list, got nothing", None, [])
+    val, idx = token
     if idx == -1:
-        try:
-            val1, idx1 = next(lex)
-        except StopIteration:  # no last token
+        token = next(lex, None)
+        if token is None:  # no last token
             raise IncompleteParse(
                 "Expected %s, got nothing" %
                 ("something" if val == '\\' else '"'),
                 None, [' ' if val == '\\' else '"'])
+        val1, idx1 = token
         if idx1 == -1:  # signal we want both a \ ending and a "
-            try:  # check if the last token waits.
-                val1, idx1 = next(lex)
-                raise IncompleteParse(
-                    "Expected something and \", got nothing",
-                    (val1, idx1), [' "'])
-            except StopIteration:
-                raise IncompleteParse(
-                    "Expected something and \", got nothing",
-                    None, [' "'])
+            # the last token, if any
+            raise IncompleteParse(
+                "Expected something and \", got nothing",
+                next(lex, None), [' "'])
         else:  # val1, idx1 holds the last token
             raise IncompleteParse(
                 "Expected %s, got nothing" %
@@ -656,7 +747,7 @@ def parse_string_or_list(lex):
                 (val1, idx1), [' ' if val == '\\' else '"'])
     elif val == '(':
         try:
-            return parse_list(), idx
+            return _parse_list(lex), idx
         except IncompleteParse as e:
             e.parse = (e.parse, idx)
             raise
@@ -664,67 +755,112 @@ def parse_string_or_list(lex):
         return val, idx
 
 
+# Character classes for the lexer.  Any other character is part of a token,
+# unless it is non-ascii whitespace.
+_SPACE, _QUOTE, _PAREN, _ESCAPE = ('space', 'quote', 'paren', 'escape')
+_char_classes = dict(
+    {c: _SPACE for c in map(chr, range(128)) if c.isspace()},
+    **{'"': _QUOTE, '(': _PAREN, ')': _PAREN, '\\': _ESCAPE})
+
+
 def lexer(text):
     """
     Generates tokens from the text
 
-    :type text: six.text_type
+    :type text: str
     :param text: The text to tokenize.
 
     :rtype: generator
     :returns:
         A generator that yields (token, offset) pairs.
 
-    >>> list(lexer(u'group info foo'))
-    [(u'group', 0), (u'info', 6), (u'foo', 11)]
+    >>> list(lexer('group info foo'))
+    [('group', 0), ('info', 6), ('foo', 11)]
     """
-    if not isinstance(text, six.text_type):
+    if not isinstance(text, str):
         raise TypeError("invalid type %s, expected %s" %
-                        (type(text).__name__, six.text_type.__name__))
-    ret = []
+                        (type(text).__name__, str.__name__))
+    if not ('"' in text or '(' in text or ')' in text or '\\' in text):
+        # Nothing to unquote or escape, the tokens are just the words
+        pos = 0
+        for token in text.split():
+            pos = text.find(token, pos)
+            yield token, pos
+            pos += len(token)
+        return
+    # Tokens are sliced from the text, rather than built char by char.  A
+    # token is split into several parts only if it contains quotes or
+    # escaped characters.
+    parts = []  # completed parts of the current token
+    seg = None  # start of the current part, if any
     start = 0
     inquotes = False
     internalquotes = False
     backslash = False
+    char_class = _char_classes.get
     for i, cur in enumerate(text):
         if backslash:
-            if not ret:
+            if not parts:
                 start = i - 1
-            ret.append(cur)
+            seg = i
             backslash = False
         elif inquotes:
             if cur == '"':
                 inquotes = False
+                if seg < i:
+                    parts.append(text[seg:i])
+                seg = None
                 if not internalquotes:
-                    internalquotes = False
-                    yield ''.join(ret), start
-                    ret = []
-            else:
-                ret.append(cur)
-        elif cur == '(' or cur == ')':
-            if ret:
-                yield ''.join(ret), start
-                ret = []
-            yield cur, i
-        elif cur == '"':
-            inquotes = True
-            internalquotes = bool(ret)
-            if not internalquotes:
-                start = i
-        elif cur.isspace():
-            if ret:
-                yield ''.join(ret), start
-                ret = []
-                # yield ' ', i
-        elif cur == '\\':
-            backslash = True
+                    yield ''.join(parts), start
+                    parts = []
         else:
-            if not ret:
-                start = i
-            ret.append(cur)
+            kind = char_class(cur)
+            if kind is None:
+                if cur > '\x7f' and cur.isspace():
+                    kind = _SPACE
+                else:
+                    if seg is None:
+                        if not parts:
+                            start = i
+                        seg = i
+                    continue
+            if kind is _SPACE:
+                if seg is not None:
+                    if not parts:
+                        yield text[seg:i], start
+                        seg = None
+                        continue
+                    parts.append(text[seg:i])
+                    seg = None
+                if parts:
+                    yield ''.join(parts), start
+                    parts = []
+            elif kind is _PAREN:
+                if seg is not None:
+                    parts.append(text[seg:i])
+                    seg = None
+                if parts:
+                    yield ''.join(parts), start
+                    parts = []
+                yield cur, i
+            elif kind is _QUOTE:
+                inquotes = True
+                if seg is not None:
+                    parts.append(text[seg:i])
+                internalquotes = bool(parts)
+                if not internalquotes:
+                    start = i
+                seg = i + 1
+            else:
+                backslash = True
+                if seg is not None:
+                    parts.append(text[seg:i])
+                    seg = None
     if backslash:
         yield '\\', -1
     if inquotes:
         yield '"', -1
-    if ret:
-        yield ''.join(ret), start
+    if seg is not None and seg < len(text):
+        parts.append(text[seg:])
+    if parts:
+        yield ''.join(parts), start
@@ -134,9 +134,10 @@ class _Command(object):
         self._group = group
         self._bofh = group._bofh
         self._args = args
-        self._format_suggestion = None
         self._help = None
         self._fullname = fullname
+        # Data derived from the command by bofh.parser
+        self._parser_cache = dict()
 
     def _get_help(self):
         """Get help from bofh, or return cached help string"""
@@ -152,13 +153,22 @@ class _Command(object):
 
     def _get_format_suggestion(self):
         """Get format suggestion for command"""
-        if self._format_suggestion is None:
+        # Note: Commands without a format suggestion gets a None-value, which
+        # should also be cached.
+        if not hasattr(self, '_format_suggestion'):
             self._format_suggestion = self._bofh.get_format_suggestion(
                 self._fullname)
         return self._format_suggestion
     format_suggestion = property(_get_format_suggestion,
                                  doc="Get format suggestion")
 
+    def _get_formatter(self):
+        """Get (cached) response formatter for command"""
+        if not hasattr(self, '_formatter'):
+            self._formatter = get_formatter(self.format_suggestion)
+        return self._formatter
+    formatter = property(_get_formatter, doc="Get response formatter")
+
     def __call__(self, *rest, **kw):
         """Call bofh with args
 
@@ -187,7 +197,7 @@ class _Command(object):
         logger.debug('got response: %r', ret)
 
         if with_format:
-            formatter = get_formatter(self.format_suggestion)
+            formatter = self.formatter
             logger.debug("formatting response with %r", type(formatter))
             if any(isinstance(i, (list, tuple)) for i in args):
                 return [formatter(r) for r in ret]
@@ -199,12 +209,12 @@ class _Command(object):
     def prompt_missing_args(self, prompt_func, *rest, **kw):
         """Prompts the user for additional args"""
         args = self.args
-        logger.debug('prompt_missing_args(%s, *rest, **kw) '
-                     'rest=%s, kw=%s, args=%s',
-                     repr(prompt_func), repr(rest), repr(kw), repr(args))
+        logger.debug('prompt_missing_args(%r, *rest, **kw) '
+                     'rest=%r, kw=%r, args=%r',
+                     prompt_func, rest, kw, args)
         if args and isinstance(args[0], _PromptFunc):
-            logger.debug("prompt_missing_args() using _PromptFunc=%s",
-                         repr(args[0]))
+            logger.debug("prompt_missing_args() using _PromptFunc=%r",
+                         args[0])
             return self._prompt_func(prompt_func, *rest, **kw)
         if len(rest) > len(args):
             logger.debug("prompt_missing_args() has enough args (%d > %d)",
@@ -229,8 +239,8 @@ class _Command(object):
                 if not ans and args[i].optional:
                     return arglst
                 ret.append(ans)
-        logger.debug('prompt_missing_args() done, rest=%s, ret=%s',
-                     repr(rest), repr(ret))
+        logger.debug('prompt_missing_args() done, rest=%r, ret=%r',
+                     rest, ret)
         return rest + ret
 
     def get_default_param(self, num, args):
@@ -334,11 +344,14 @@ class _CommandGroup(object):
         self._name = name
         self._bofh = bofh
         self._cmds = dict()
+        # Data derived from the commands by bofh.parser
+        self._parser_cache = dict()
 
     def _add_command(self, cmd, full_cmd, args):
         command = _Command(self, cmd, full_cmd, args)
         self._cmds[cmd] = command
         setattr(self, cmd, command)
+        self._parser_cache.clear()
 
     def get_bofh_command_keys(self):
         """Get the list of group keys"""
@@ -386,7 +399,10 @@ class Bofh(object):
     def __init__(self, url, context=None, timeout=None):
         """Connect to a bofh server"""
         self._connection = None
+        self._transport = None
         self._groups = dict()
+        # Data derived from the command groups by bofh.parser
+        self._parser_cache = dict()
         self._connect(url, context=context, timeout=timeout)
 
     def _connect(self, url, context=None, timeout=None):
@@ -398,17 +414,16 @@ class Bofh(object):
         if timeout is not None:
             args['timeout'] = timeout
 
+        # The transport keeps a single HTTP/1.1 connection open, and re-uses
+        # it for all subsequent calls to the same host.
         if parts.scheme == 'https':
             args['context'] = context
-            self._connection = _xmlrpc.ServerProxy(
-                url,
-                transport=https.SafeTransport(**args))
+            self._transport = https.SafeTransport(**args)
         elif parts.scheme == 'http':
-            self._connection = _xmlrpc.ServerProxy(
-                url,
-                transport=https.Transport(**args))
+            self._transport = https.Transport(**args)
         else:
             raise BofhError("Unsupported protocol: '%s'" % parts.scheme)
+        self._connection = _xmlrpc.ServerProxy(url, transport=self._transport)
         # Test for valid server connection, handle thrown exceptions.
         try:
             self.get_motd()
@@ -506,6 +521,11 @@ class Bofh(object):
         self._session = None
         # XXX bring down all commands
 
+    def close(self):
+        """Close the persistent connection to the server"""
+        if self._transport is not None:
+            self._transport.close()
+
     def get_commands(self):
         """Get commands user can operate on"""
         return self._run_raw_sess_command("get_commands")
@@ -541,7 +561,9 @@ class Bofh(object):
     @property
     def motd(self):
         """Get (cached) message of the day from bofh server"""
-        return getattr(self, '_motd', self.get_motd())
+        if hasattr(self, '_motd'):
+            return self._motd
+        return self.get_motd()
 
     def _init_commands(self, reset=False):
         """
@@ -570,6 +592,7 @@ class Bofh(object):
                 self._groups[group] = grp
                 setattr(self, group, grp)
             self._groups[group]._add_command(cmd, key, args)
+        self._parser_cache.clear()
 
     def get_bofh_command_keys(self):
         """Get the list of group keys"""
@@ -33,11 +33,10 @@ import six
 from six.moves import input as _raw_input
 
 from . import parser, proto
+from .config import DEFAULT_PROMPT
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_PROMPT = "bofh>>> "
-
 
 class IOUtil(object):
     """
@@ -182,9 +181,9 @@ def prompter(prompt, mapping, help, default, argtype=None, optional=False):
     :type argtype: unicode
     :optional: True if this arg is optional
     """
-    logger.debug('prompter(prompt=%s, mapping=%s, help=%s, default=%s,'
-                 ' argtype=%s, optional=%s)', repr(prompt), repr(mapping),
-                 repr(help), repr(default), repr(argtype), repr(optional))
+    logger.debug('prompter(prompt=%r, mapping=%r, help=%r, default=%r,'
+                 ' argtype=%r, optional=%r)', prompt, mapping,
+                 help, default, argtype, optional)
     # tell the user about the default value by including it in the prompt
     if default is not None:
         _prompt = "%s [%s] > " % (prompt, default)
@@ -323,10 +322,10 @@ def repl(bofh, charset=None, prompt=None):
         try:
             # eval
             parse = parser.parse(bofh, line)
-            logger.debug("Got obj=%s, command=%r",
-                         repr(parse), repr(getattr(parse, 'command', None)))
+            logger.debug("Got obj=%r, command=%r",
+                         parse, getattr(parse, 'command', None))
             result = parse.eval(prompter=prompter, prompt=prompt)
-            logger.debug("Got result=%s", repr(result))
+            logger.debug("Got result=%r", result)
 
             if isinstance(result, list):
                 result = '\n\n'.join(result)
@@ -26,6 +26,8 @@ import getpass
 import sys
 import textwrap
 
+import bofh
+import bofh.config
 import bofh.proto
 import bofh.version
 
@@ -40,20 +42,32 @@ header = textwrap.dedent(
 ).strip().format(bofh.version.version)
 print(header)
 
+# A single connection and session is used for all commands
+username = getpass.getuser()
 try:
-    bofhcom = bofh.connect(getpass.getuser(), getpass.getpass())
+    bofhcom = bofh.connect(bofh.config.get_default_url(),
+                           cert=bofh.config.get_default_cafile())
+    bofhcom.login(username, getpass.getpass())
 except bofh.proto.BofhError as e:
     print(e.args[0], file=sys.stderr)
     sys.exit(1)
 
-newpass = getpass.getpass("New password: ")
+try:
+    newpass = getpass.getpass("New password: ")
 
-if newpass != getpass.getpass("Repeat: "):
-    print("Passwords doesn't match")
-else:
+    if newpass != getpass.getpass("Repeat: "):
+        print("Passwords doesn't match")
+    else:
+        try:
+            print(bofhcom.user.password(username, newpass))
+            print("Password changed")
+        except bofh.proto.BofhError as e:
+            print(e.args[0], file=sys.stderr)
+            sys.exit(1)
+except (KeyboardInterrupt, EOFError):
+    print("")
+finally:
     try:
-        print(bofhcom.user.password(getpass.getuser(), newpass))
-        print("Password changed")
-    except bofh.proto.BofhError as e:
-        print(e.message, file=sys.stderr)
-        sys.exit(1)
+        bofhcom.logout()
+    finally:
+        bofhcom.close()
@@ -154,6 +154,7 @@ def main():
         license='GPLv3',
 
         use_scm_version=True,
+        python_requires='>=3.6',
 
         setup_requires=setup_requirements,
         install_requires=install_requirements,
@@ -172,7 +173,6 @@ def main():
             'Environment :: Console',
             'Intended Audience :: System Administrators',
             'License :: OSI Approved :: GNU General Public License v3 (GPLv3)',
-            'Programming Language :: Python :: 2.7',
             'Programming Language :: Python :: 3.6',
             'Programming Language :: Python :: 3.7',
             'Programming Language :: Python :: 3.8',
@@ -68,3 +68,24 @@ def bofh(url):
     the functions that needs it should be refactored.
     """
     return MockBofh(url, None)
+
+
+# A get_commands response, see bofh.proto.Bofh._init_commands()
+COMMANDS = {
+    'user_info': [['user', 'info'], [{'type': 'accountName'}]],
+    'user_create': [['user', 'create'], [{'type': 'personId'},
+                                         {'type': 'accountName',
+                                          'optional': True}]],
+    'group_info': [['group', 'info'], [{'type': 'groupName'}]],
+    'group_add': [['group', 'add'], [{'type': 'accountName'},
+                                     {'type': 'groupName'}]],
+}
+
+
+@pytest.fixture
+def bofh_commands(bofh):
+    """ a bofh.proto.Bofh stub with the commands from COMMANDS. """
+    bofh._session = None
+    bofh._connection.get_commands = lambda session: COMMANDS
+    Bofh._init_commands(bofh)
+    return bofh
@@ -0,0 +1,43 @@
+from __future__ import unicode_literals
+
+import logging
+
+import pytest
+
+from bofh.cli import complete_url
+from bofh.cli import setup_logging
+
+
+@pytest.mark.parametrize("url", (
+    'https://localhost:8000/',
+    'http://localhost:8080',
+))
+def test_complete_url(url):
+    assert complete_url(url) == url
+
+
+def test_complete_url_none():
+    assert complete_url(None) is None
+
+
+@pytest.mark.parametrize("url,expect", (
+    ('localhost', 'https://localhost:8000'),
+    ('localhost:8962', 'https://localhost:8962'),
+    ('http://localhost', 'http://localhost:8000'),
+    ('https://localhost/foo', 'https://localhost:8000/foo'),
+))
+def test_complete_url_defaults(url, expect):
+    assert complete_url(url) == expect
+
+
+def test_setup_logging_quiet_idempotent():
+    root = logging.getLogger()
+    handlers = list(root.handlers)
+    try:
+        setup_logging(-1)
+        setup_logging(-1)
+        added = [h for h in root.handlers if h not in handlers]
+        assert len(added) == 1
+        assert isinstance(added[0], logging.NullHandler)
+    finally:
+        root.handlers = handlers
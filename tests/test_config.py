@@ -0,0 +1,82 @@
+from __future__ import unicode_literals
+
+import logging
+
+import pytest
+
+from bofh import config
+
+
+@pytest.fixture
+def config_dirs(tmpdir, monkeypatch):
+    """ two config dirs, 'first' and 'second' (which doesn't exist) """
+    first = tmpdir.mkdir('first')
+    second = tmpdir.join('second')
+    monkeypatch.setattr(config, 'DEFAULT_CONFIG_PATH',
+                        (str(first), str(second)))
+    config.invalidate_config_cache()
+    yield first, second
+    config.invalidate_config_cache()
+
+
+def test_get_config_file(config_dirs):
+    first, _ = config_dirs
+    first.join('foo.txt').write('foo')
+    assert config.get_config_file('foo.txt') == str(first.join('foo.txt'))
+
+
+def test_get_config_file_missing(config_dirs):
+    assert config.get_config_file('foo.txt') is None
+
+
+def test_get_config_file_order(config_dirs):
+    first, second = config_dirs
+    second.mkdir()
+    second.join('foo.txt').write('foo')
+    first.join('foo.txt').write('foo')
+    config.invalidate_config_cache()
+    assert config.get_config_file('foo.txt') == str(first.join('foo.txt'))
+
+
+def test_get_config_file_cached(config_dirs):
+    first, _ = config_dirs
+    first.join('foo.txt').write('foo')
+    expect = str(first.join('foo.txt'))
+    assert config.get_config_file('foo.txt') == expect
+    first.join('foo.txt').remove()
+    assert config.get_config_file('foo.txt') == expect
+    config.invalidate_config_cache()
+    assert config.get_config_file('foo.txt') is None
+
+
+def test_get_config_file_relative_path(config_dirs):
+    first, _ = config_dirs
+    first.mkdir('sub').join('foo.txt').write('foo')
+    config.invalidate_config_cache()
+    assert (config.get_config_file('sub/foo.txt') ==
+            str(first.join('sub').join('foo.txt')))
+    assert config.get_config_file('sub/bar.txt') is None
+
+
+def test_get_config_file_absolute_path(config_dirs, tmpdir):
+    tmpdir.join('foo.txt').write('foo')
+    assert (config.get_config_file(str(tmpdir.join('foo.txt'))) ==
+            str(tmpdir.join('foo.txt')))
+    assert config.get_config_file(str(tmpdir.join('bar.txt'))) is None
+
+
+@pytest.fixture
+def root_logger():
+    """ the root logger, with handlers and level restored after use """
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    yield root
+    root.handlers, root.level = handlers, level
+
+
+def test_configure_logging(root_logger):
+    root_logger.handlers = []
+    config.configure_logging(logging.INFO)
+    config.configure_logging(logging.DEBUG)
+    assert len(root_logger.handlers) == 1
+    assert root_logger.level == logging.INFO
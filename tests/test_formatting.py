@@ -5,7 +5,7 @@ import pytest
 
 from bofh.formatting import FieldRef
 from bofh.formatting import FormatItem
-# from bofh.formatting import FormatSuggestion
+from bofh.formatting import FormatSuggestion
 from bofh.formatting import StringFormatter
 from bofh.formatting import SuggestionFormatter
 from bofh.formatting import get_formatted_field
@@ -25,6 +25,7 @@ response_data = {
     ('yyyy MM dd HH mm ss', '%Y %m %d %H %M %S'),
     ("foo yyyy bar", "foo %Y bar"),
     ("yyyy yy yyyy", "%Y yy %Y"),
+    ("dd.MM.yyyy HH:mm:ss", "%d.%m.%Y %H:%M:%S"),
 
 ))
 def test_sdf_formats(sdf, strftime):
@@ -70,6 +71,16 @@ def test_field_ref_parse_type():
     assert ref.params == 'baz'
 
 
+def test_field_ref_parse_partial():
+    ref = FieldRef.from_str('foo:bar')
+    assert ref.name == 'foo:bar'
+    assert ref.type is None
+
+
+def test_field_ref_parse_cached():
+    assert FieldRef.from_str('foo') is FieldRef.from_str('foo')
+
+
 def test_get_field_none():
     ref = FieldRef('foo')
     data = {'foo': None, }
@@ -101,12 +112,97 @@ def test_format_item():
     assert item.format(data) == expect
 
 
+def test_format_suggestion_from_dict():
+    fs = FormatSuggestion.from_dict({
+        'hdr': 'header',
+        'str_vars': [
+            ("foo: %s", ("foo",)),
+            ("bar: %s, date: %s", ("bar", "dateval:date:yyyy"), "sub"),
+        ],
+    })
+    assert fs.header == 'header'
+    assert len(fs) == 2
+    first, second = fs
+    assert second.header == 'sub'
+    for item in (first, second):
+        assert isinstance(item.fields, tuple)
+        assert all(isinstance(f, FieldRef) for f in item.fields)
+    assert second.fields[1].type == 'date'
+
+
+def test_format_suggestion_from_str():
+    fs = FormatSuggestion.from_dict({'str_vars': 'foo'})
+    assert len(fs) == 1
+    item, = fs
+    assert item.format({}) == 'foo'
+
+
 def test_get_string_formatter():
     f = get_formatter(None)
     assert isinstance(f, StringFormatter)
 
 
+def test_get_string_formatter_shared():
+    assert get_formatter(None) is get_formatter({})
+
+
 def test_get_sugg_formatter():
     fs = {'str_vars': 'foo'}
     f = get_formatter(fs)
     assert isinstance(f, SuggestionFormatter)
+
+
+def test_format_item_try_format():
+    fmt = "foo:%s bar=%s"
+    fields = tuple(map(FieldRef, ("foo", "bar")))
+    item = FormatItem(fmt, fields=fields)
+    data = {'foo': 'asd', 'bar': None}
+    assert item.try_format(data) == "foo:asd bar=<not set>"
+
+
+def test_format_item_try_format_mismatch():
+    fields = tuple(map(FieldRef, ("foo", "bar")))
+    item = FormatItem("foo:%s bar=%s", fields=fields)
+    assert item.try_format({'foo': 'asd'}) is None
+
+
+def test_format_item_mismatches():
+    fields = tuple(map(FieldRef, ("foo", "bar", "baz")))
+    item = FormatItem("%s %s %s", fields=fields)
+    assert item.mismatches({'foo': 1, 'bar': 2, 'baz': 3}) == ()
+    assert item.match({'foo': 1, 'bar': 2, 'baz': 3})
+    assert item.mismatches({'bar': 2}) == ('foo', 'baz')
+    assert not item.match({'bar': 2})
+
+
+def test_sugg_formatter_skips_mismatch():
+    f = get_formatter({'str_vars': [("foo: %s", ("foo",)),
+                                    ("bar: %s", ("bar",))]})
+    response = [{'foo': 1}, {'bar': 2}, "text"]
+    assert f(response) == "\n".join(("foo: 1", "text", "bar: 2", "text"))
+
+
+def test_sugg_formatter_skips_non_dict(caplog):
+    f = get_formatter({'str_vars': [("foo: %s", ("foo",))]})
+    response = [{'foo': 1}, ['foo'], "text"]
+    assert f(response) == "\n".join(("foo: 1", "text"))
+    assert not [r for r in caplog.records if r.levelname == 'ERROR']
+
+
+def test_format_item_match_non_dict():
+    item = FormatItem("%s", fields=(FieldRef('foo'),))
+    assert not item.match(['bar'])
+    assert item.mismatches(['bar']) == ('foo',)
+
+
+def test_get_field_invalid_type():
+    ref = FieldRef('foo', 'bar')
+    with pytest.raises(ValueError):
+        get_formatted_field(ref, {'foo': 'bar'})
+
+
+def test_format_suggestion_reusable():
+    items = (FormatItem("foo: %s", fields=(FieldRef('foo'),)) for _ in "ab")
+    f = SuggestionFormatter(FormatSuggestion(items))
+    assert f([{'foo': 1}]) == "foo: 1\nfoo: 1"
+    assert f([{'foo': 2}]) == "foo: 2\nfoo: 2"
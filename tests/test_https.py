@@ -0,0 +1,123 @@
+from __future__ import unicode_literals
+
+import ssl
+
+import pytest
+
+from bofh import https
+
+
+class MockSocket(object):
+    def __init__(self, session=None):
+        self.session = session
+        self.session_reused = False
+        self.closed = False
+
+    def getpeercert(self):
+        return {}
+
+    def shutdown(self, how):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class MockContext(object):
+    check_hostname = True
+    verify_mode = ssl.CERT_REQUIRED
+    post_handshake_auth = None
+
+    def __init__(self):
+        self.wrapped = []
+        self.sessions = []
+
+    def set_alpn_protocols(self, protocols):
+        pass
+
+    def wrap_socket(self, sock, server_hostname=None, session=None):
+        self.wrapped.append((server_hostname, session))
+        if session is not None and session not in self.sessions:
+            raise ValueError("Session refers to a different SSLContext.")
+        self.sessions.append(object())
+        return MockSocket(session=self.sessions[-1])
+
+
+@pytest.fixture
+def context(monkeypatch):
+    def connect(conn):
+        conn.sock = MockSocket()
+
+    monkeypatch.setattr(https.HTTPConnection, 'connect', connect)
+    return MockContext()
+
+
+def test_connection_resumes_session(context):
+    conn = https._ResumingHTTPSConnection('localhost', 8000, context=context)
+    conn.connect()
+    session = conn.sock.session
+    conn.close()
+    assert conn.tls_session is session
+    conn.connect()
+    assert context.wrapped == [('localhost', None), ('localhost', session)]
+
+
+def test_transport_resumes_session(context):
+    transport = https.SafeTransport(context=context)
+    conn = transport.make_connection('localhost:8000')
+    conn.connect()
+    session = conn.sock.session
+    transport.close()
+    conn = transport.make_connection('localhost:8000')
+    conn.connect()
+    assert context.wrapped[-1] == ('localhost', session)
+
+
+def test_bofh_close(bofh, context):
+    bofh._transport = https.SafeTransport(context=context)
+    conn = bofh._transport.make_connection('localhost:8000')
+    conn.connect()
+    sock = conn.sock
+    bofh.close()
+    assert sock.closed
+    assert conn.sock is None
+    assert bofh._transport._tls_session is sock.session
+
+
+def test_connection_checks_hostname(context, monkeypatch):
+    # Emulate the Python 3.6 fallback when the context skips the check
+    def match_hostname(cert, hostname):
+        raise ssl.CertificateError(hostname)
+
+    monkeypatch.setattr(https.ssl, 'match_hostname', match_hostname,
+                        raising=False)
+    context.check_hostname = False
+    conn = https._ResumingHTTPSConnection('localhost', 8000, context=context)
+    conn._check_hostname = True
+    with pytest.raises(ssl.CertificateError):
+        conn.connect()
+
+
+def test_connection_skips_foreign_session(context):
+    conn = https._ResumingHTTPSConnection('localhost', 8000, context=context,
+                                          tls_session=object())
+    conn.connect()
+    assert conn.tls_session is None
+    assert context.wrapped[-1] == ('localhost', None)
+
+
+def test_transport_without_context(context, monkeypatch):
+    # Each connection gets its own default context
+    contexts = []
+
+    def create_context():
+        contexts.append(MockContext())
+        return contexts[-1]
+
+    monkeypatch.setattr(ssl, '_create_default_https_context', create_context)
+    transport = https.SafeTransport()
+    transport.make_connection('localhost:8000').connect()
+    transport.close()
+    transport.make_connection('localhost:8000').connect()
+    assert len(contexts) == 2
+    assert contexts[1].wrapped == [('localhost', None)]
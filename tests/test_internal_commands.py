@@ -0,0 +1,98 @@
+from __future__ import unicode_literals
+
+import os
+
+import pytest
+
+from bofh import internal_commands
+
+
+def test_commands(bofh_commands):
+    assert internal_commands.commands(bofh_commands) == "\n".join((
+        "group_add   -> ['group', 'add', "
+        "'{type: accountName, optional: False, default: None}', "
+        "'{type: groupName, optional: False, default: None}']",
+        "group_info  -> ['group', 'info', "
+        "'{type: groupName, optional: False, default: None}']",
+        "user_create -> ['user', 'create', "
+        "'{type: personId, optional: False, default: None}', "
+        "'{type: accountName, optional: True, default: None}']",
+        "user_info   -> ['user', 'info', "
+        "'{type: accountName, optional: False, default: None}']",
+    ))
+
+
+def test_commands_empty(bofh):
+    assert internal_commands.commands(bofh) == ""
+
+
+def test_source(bofh, tmpdir):
+    script = tmpdir.join('script.txt')
+    script.write("# comment\n\nhelp commands\n")
+    assert internal_commands.source(bofh, script=str(script)) == [
+        "bofh>>> help commands\ncommands -- list commands",
+    ]
+
+
+def test_source_error(bofh, tmpdir):
+    script = tmpdir.join('script.txt')
+    script.write("foo bar\nhelp quit\n")
+    result = internal_commands.source(bofh, script=str(script))
+    assert result[0] == "Error: Unknown command"
+    assert len(result) == 3
+
+
+def test_source_ignore_errors(bofh, tmpdir):
+    script = tmpdir.join('script.txt')
+    script.write("foo bar\nhelp quit\n")
+    result = internal_commands.source(bofh, script=str(script),
+                                      ignore_errors=True)
+    assert result == [
+        "Error: Unknown command (on line 1)",
+        "bofh>>> help quit\nquit -- quit bofh",
+    ]
+
+
+def test_source_quit(bofh, tmpdir):
+    script = tmpdir.join('script.txt')
+    script.write("quit\nhelp quit\n")
+    with pytest.raises(SystemExit):
+        internal_commands.source(bofh, script=str(script), ignore_errors=True)
+
+
+@pytest.mark.parametrize("filename", ("missing.txt", "", "file.txt/x"))
+def test_source_missing(bofh, tmpdir, filename):
+    tmpdir.join('file.txt').write("quit\n")
+    script = str(tmpdir.join(filename))
+    assert internal_commands.source(bofh, script=script) == (
+        'Filename "{}" does not exist.'.format(script))
+
+
+@pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="requires mkfifo")
+def test_source_fifo(bofh, tmpdir):
+    script = str(tmpdir.join('fifo'))
+    os.mkfifo(script)
+    assert internal_commands.source(bofh, script=script) == (
+        'Filename "{}" does not exist.'.format(script))
+
+
+def test_help_internal(bofh):
+    assert internal_commands.help(bofh, 'quit') == "quit -- quit bofh"
+
+
+def test_help_list(bofh):
+    assert internal_commands.help(bofh, ('quit', 'commands')) == "\n".join((
+        "quit -- quit bofh",
+        "commands -- list commands",
+    ))
+
+
+def test_source_nested(bofh, tmpdir):
+    inner = tmpdir.join('inner.txt')
+    inner.write("help quit\n")
+    outer = tmpdir.join('outer.txt')
+    outer.write("source {}\n".format(inner))
+    assert internal_commands.source(bofh, script=str(outer)) == [
+        "bofh>>> source {}".format(inner),
+        "bofh>>> help quit\nquit -- quit bofh",
+    ]
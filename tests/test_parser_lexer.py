@@ -37,3 +37,39 @@ def test_quotes_escape():
     text = 'foo \\"bar'
     result = list(lexer(text))
     assert result == [('foo', 0), ('"bar', 4)]
+
+
+def test_quotes_internal():
+    text = 'foo"bar baz"x y'
+    result = list(lexer(text))
+    assert result == [('foobar bazx', 0), ('y', 14)]
+
+
+def test_quotes_empty():
+    text = 'foo ""'
+    result = list(lexer(text))
+    assert result == [('foo', 0), ('', 4)]
+
+
+def test_escape_space():
+    text = 'foo\\ bar baz'
+    result = list(lexer(text))
+    assert result == [('foo bar', 0), ('baz', 9)]
+
+
+def test_escape_incomplete():
+    text = 'foo\\'
+    result = list(lexer(text))
+    assert result == [('\\', -1), ('foo', 0)]
+
+
+def test_parens():
+    text = 'foo (bar baz)'
+    result = list(lexer(text))
+    assert result == [('foo', 0), ('(', 4), ('bar', 5), ('baz', 9), (')', 12)]
+
+
+def test_whitespace():
+    text = ' foo\tbar  foo '
+    result = list(lexer(text))
+    assert result == [('foo', 1), ('bar', 5), ('foo', 10)]
@@ -0,0 +1,183 @@
+from __future__ import unicode_literals
+
+import pytest
+
+from bofh import parser
+from bofh.proto import Bofh
+
+
+def _completions(cmd):
+    """ get the (arg, index, completions) of a parsed command. """
+    return [(arg, idx, tuple(completes))
+            for arg, idx, completes in cmd.args
+            if isinstance(completes, (list, tuple))]
+
+
+@pytest.mark.parametrize("prefix, expected", (
+    ('', ('group', 'help', 'quit', 'user')),
+    ('u', ('user',)),
+    ('user', ('user',)),
+    ('users', ()),
+    ('x', ()),
+))
+def test_command_index(prefix, expected):
+    index = parser.CommandIndex(('user', 'quit', 'group', 'help'))
+    assert index.startswith(prefix) == expected
+
+
+def test_command_index_contains():
+    index = parser.CommandIndex(('user', 'quit', 'group', 'help'))
+    assert 'user' in index
+    assert 'use' not in index
+    assert 'users' not in index
+    assert 'zzz' not in index
+    assert '' not in index
+
+
+def test_parse_bofh_command(bofh_commands):
+    cmd = parser.parse(bofh_commands, 'user info foo')
+    assert isinstance(cmd, parser.BofhCommand)
+    assert cmd.command is bofh_commands.user.info
+    assert _completions(cmd) == [('user', 0, ('user',)),
+                                 ('info', 5, ('info',))]
+    assert cmd.args[2][:2] == ('foo', 10)
+
+
+def test_parse_bofh_command_completers(bofh_commands):
+    first = parser.parse(bofh_commands, 'user info foo')
+    second = parser.parse(bofh_commands, 'user info')
+    completer = first.args[2][2]
+    assert isinstance(completer, parser.ArgCompleter)
+    assert completer.arg is bofh_commands.user.info.args[0]
+    assert second.args[2] == ('', -1, completer)
+
+
+def test_parse_bofh_command_prefix(bofh_commands):
+    cmd = parser.parse(bofh_commands, 'us inf foo')
+    assert cmd.command is bofh_commands.user.info
+    assert _completions(cmd) == [('us', 0, ('user',)),
+                                 ('inf', 3, ('info',))]
+
+
+def test_parse_incomplete_command(bofh_commands):
+    with pytest.raises(parser.IncompleteParse) as exc_info:
+        parser.parse(bofh_commands, 'user')
+    assert tuple(exc_info.value.completions) == ('create', 'info')
+
+
+@pytest.mark.parametrize("line, completions", (
+    ('', ('commands', 'group', 'help', 'quit', 'script', 'source', 'user')),
+    ('x', ()),
+))
+def test_parse_no_group(bofh_commands, line, completions):
+    with pytest.raises(parser.NoGroup) as exc_info:
+        parser.parse(bofh_commands, line)
+    assert tuple(exc_info.value.completions) == completions
+
+
+def test_parse_single(bofh_commands):
+    cmd = parser.parse(bofh_commands, 'qu')
+    assert isinstance(cmd, parser.SingleCommand)
+    assert cmd.args == [('qu', 0, ['quit'])]
+
+
+def test_parse_help(bofh_commands):
+    cmd = parser.parse(bofh_commands, 'he')
+    assert isinstance(cmd, parser.HelpCommand)
+    assert _completions(cmd) == [
+        ('he', 0, ('help',)),
+        ('', -1, ('commands', 'group', 'help', 'quit', 'script', 'source',
+                  'user')),
+    ]
+
+
+def test_parse_help_group(bofh_commands):
+    cmd = parser.parse(bofh_commands, 'help user')
+    assert _completions(cmd) == [('help', 0, ('help',)),
+                                 ('user', 5, ('user',)),
+                                 (None, -1, ('create', 'info'))]
+
+
+def test_parse_help_command(bofh_commands):
+    cmd = parser.parse(bofh_commands, 'help user in')
+    assert _completions(cmd) == [('help', 0, ('help',)),
+                                 ('user', 5, ('user',)),
+                                 ('in', 10, ('info',))]
+
+
+def test_parse_help_list(bofh_commands):
+    cmd = parser.parse(bofh_commands, 'help (user gr)')
+    assert cmd.args[1] == (
+        (('user', 6, ['user']), ('gr', 11, ['group'])), 5, [])
+
+
+def test_parse_help_internal(bofh_commands):
+    with pytest.raises(parser.SynErr):
+        parser.parse(bofh_commands, 'help quit foo')
+
+
+def test_parse_source(bofh_commands):
+    cmd = parser.parse(bofh_commands, 'source --ig')
+    assert isinstance(cmd, parser.InternalCommand)
+    assert cmd.args == [('source', 0, ['source']),
+                        ('--ig', 7, ['--ignore-errors'])]
+
+
+def test_parse_source_file(bofh_commands, tmp_path):
+    script = tmp_path / 'script'
+    script.write_text('quit\n')
+    link = tmp_path / 'link'
+    link.symlink_to(script)
+    for name in (script, link):
+        cmd = parser.parse(bofh_commands, 'source %s' % name)
+        assert cmd.args[2] == (str(name), 7, [str(name)])
+    cmd = parser.parse(bofh_commands, 'source %s' % tmp_path)
+    assert isinstance(cmd.args[2][2], parser.FileCompleter)
+
+
+def test_parse_cache_reset(bofh_commands):
+    assert parser.get_bofh_commands(bofh_commands) == ('group', 'user')
+    assert parser.get_bofh_commands(bofh_commands) is (
+        parser.get_bofh_commands(bofh_commands))
+
+    bofh_commands._connection.get_commands = lambda session: {
+        'user_info': [['user', 'info'], []],
+        'user_delete': [['user', 'delete'], []],
+        'host_info': [['host', 'info'], []],
+    }
+    Bofh._init_commands(bofh_commands, reset=True)
+    assert parser.get_bofh_commands(bofh_commands) == ('host', 'user')
+    assert parser.get_bofh_commands(bofh_commands, 'user') == (
+        'delete', 'info')
+    cmd = parser.parse(bofh_commands, 'user del')
+    assert cmd.command is bofh_commands.user.delete
+
+
+@pytest.mark.parametrize("text, expected", (
+    ('foo', ('foo', 0)),
+    ('(a b)', ([('a', 1), ('b', 3)], 0)),
+))
+def test_parse_string_or_list(text, expected):
+    assert parser.parse_string_or_list(parser.lexer(text)) == expected
+
+
+@pytest.mark.parametrize("text, parse, completions", (
+    ('', None, []),
+    ('"foo', ('foo', 0), ['"']),
+    ('foo\\', ('foo', 0), [' ']),
+    ('(a b', ([('a', 1), ('b', 3)], 0), []),
+    ('(a "b', ([('a', 1), ('b', 3)], 0), ['")']),
+    ('(a b\\', ([('a', 1), ('b', 3)], 0), [' )']),
+    ('(a "b\\', ([('a', 1), ('b\\', 3)], 0), ['")']),
+))
+def test_parse_string_or_list_incomplete(text, parse, completions):
+    with pytest.raises(parser.IncompleteParse) as exc_info:
+        parser.parse_string_or_list(parser.lexer(text))
+    assert exc_info.value.parse == parse
+    assert exc_info.value.completions == completions
+
+
+def test_parse_string_or_list_nested():
+    with pytest.raises(parser.SynErr) as exc_info:
+        parser.parse_string_or_list(parser.lexer('((a))'))
+    assert exc_info.value.index == 1